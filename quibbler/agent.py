@@ -2,9 +2,14 @@
 
 import asyncio
 import json
+import logging
+import os
+import time
+from collections import deque
 from contextlib import suppress
 from dataclasses import dataclass, field
 from datetime import datetime, timezone
+from functools import lru_cache
 from pathlib import Path
 from typing import Any
 
@@ -15,10 +20,26 @@ from claude_agent_sdk import (
     TextBlock,
 )
 
-from quibbler.logger import get_logger
+from quibbler.logger import Truncated, get_logger
 
 
 DEFAULT_MODEL = "claude-haiku-4-5-20251001"
+GLOBAL_CONFIG_PATH = Path.home() / ".quibbler" / "config.json"
+
+# Hook events are coalesced into one query of up to MAX_BATCH_SIZE events,
+# collected for at most BATCH_WAIT_TIME seconds after the first one arrives
+MAX_BATCH_SIZE = 10
+BATCH_WAIT_TIME = 0.5
+
+# Backpressure limits: hook mode drops the oldest events beyond
+# MAX_PENDING_EVENTS, MCP mode rejects reviews beyond MAX_PENDING_REVIEWS
+MAX_PENDING_EVENTS = 256
+MAX_PENDING_REVIEWS = 16
+
+# Built once: json.dumps constructs a fresh encoder whenever options are passed.
+# Events are sent compact - indentation roughly doubles their size in tokens
+# and keeps the encoder off its C fast path
+_EVENT_ENCODER = json.JSONEncoder(ensure_ascii=False, separators=(",", ":"))
 
 
 logger = get_logger(__name__)
@@ -27,19 +48,26 @@ logger = get_logger(__name__)
 def format_event_for_agent(evt: dict[str, Any]) -> str:
     """Format hook event for the quibbler agent"""
     event_type = evt.get("event", "UnknownEvent")
-    ts = evt.get("received_at", datetime.now(timezone.utc).isoformat())
-    pretty_json = json.dumps(evt, indent=2, ensure_ascii=False)
+    # The server stamps received_at, so only compute a fallback when it is missing
+    ts = evt.get("received_at") or datetime.now(timezone.utc).isoformat()
+    event_json = _EVENT_ENCODER.encode(evt)
 
-    return f"HOOK EVENT: {event_type}\ntime: {ts}\n\n```json\n{pretty_json}\n```"
+    return f"HOOK EVENT: {event_type}\ntime: {ts}\n\n```json\n{event_json}\n```"
 
 
-@dataclass
+@dataclass(slots=True)
 class QuibblerConfig:
     """Configuration for Quibbler agent"""
 
     model: str = DEFAULT_MODEL
 
 
+@lru_cache(maxsize=32)
+def _parse_config_file(path: Path, mtime_ns: int) -> dict[str, Any]:
+    """Parse a config file, memoized until its mtime changes"""
+    return json.loads(path.read_bytes())
+
+
 def load_config(source_path: str) -> QuibblerConfig:
     """
     Load config with project override support.
@@ -57,35 +85,45 @@ def load_config(source_path: str) -> QuibblerConfig:
     """
     # Check project-specific config first
     project_config = Path(source_path) / ".quibbler" / "config.json"
-    if project_config.exists():
-        try:
-            with open(project_config) as f:
-                data = json.load(f)
-                model = data.get("model", DEFAULT_MODEL)
-                logger.info(
-                    f"Loaded project config from {project_config}: model={model}"
-                )
-                return QuibblerConfig(model=model)
-        except Exception as e:
-            logger.warning(f"Failed to load project config from {project_config}: {e}")
+    try:
+        data = _parse_config_file(project_config, project_config.stat().st_mtime_ns)
+        model = data.get("model", DEFAULT_MODEL)
+        logger.info("Loaded project config from %s: model=%s", project_config, model)
+        return QuibblerConfig(model=model)
+    except FileNotFoundError:
+        pass
+    except Exception as e:
+        logger.warning("Failed to load project config from %s: %s", project_config, e)
 
     # Fall back to global config
-    global_config = Path.home() / ".quibbler" / "config.json"
-    if global_config.exists():
-        try:
-            with open(global_config) as f:
-                data = json.load(f)
-                model = data.get("model", DEFAULT_MODEL)
-                logger.info(f"Loaded global config from {global_config}: model={model}")
-                return QuibblerConfig(model=model)
-        except Exception as e:
-            logger.warning(f"Failed to load global config from {global_config}: {e}")
+    global_config = GLOBAL_CONFIG_PATH
+    try:
+        data = _parse_config_file(global_config, global_config.stat().st_mtime_ns)
+        model = data.get("model", DEFAULT_MODEL)
+        logger.info("Loaded global config from %s: model=%s", global_config, model)
+        return QuibblerConfig(model=model)
+    except FileNotFoundError:
+        pass
+    except Exception as e:
+        logger.warning("Failed to load global config from %s: %s", global_config, e)
 
     # Return default
-    logger.info(f"No config found, using default model: {DEFAULT_MODEL}")
+    logger.info("No config found, using default model: %s", DEFAULT_MODEL)
     return QuibblerConfig(model=DEFAULT_MODEL)
 
 
+def max_agents_from_env(default: int) -> int:
+    """Read QUIBBLER_MAX_AGENTS, falling back to `default` if it is not an integer"""
+    value = os.environ.get("QUIBBLER_MAX_AGENTS")
+    if value is None:
+        return default
+    try:
+        return max(1, int(value))
+    except ValueError:
+        logger.warning("Ignoring invalid QUIBBLER_MAX_AGENTS=%r, using %d", value, default)
+        return default
+
+
 @dataclass
 class Quibbler:
     """Base class for Quibbler agents that review code changes and maintain context"""
@@ -94,16 +132,18 @@ class Quibbler:
     source_path: str
     model: str = DEFAULT_MODEL
 
-    queue: asyncio.Queue = field(default_factory=lambda: asyncio.Queue(), init=False)
     task: asyncio.Task | None = field(default=None, init=False)
+    _prepared_system_prompt: str | None = field(default=None, init=False)
 
     async def start(self) -> None:
         """Start the quibbler agent background task"""
         if self.task is not None:
             return
         self.task = asyncio.create_task(self._run())
-        logger.info(f"Started quibbler with prompt: {self.system_prompt[:100]}...")
-        logger.info(f"Using model: {self.model}")
+        logger.info(
+            "Started quibbler with prompt: %s...", Truncated(self.system_prompt, 100)
+        )
+        logger.info("Using model: %s", self.model)
 
     async def stop(self) -> None:
         """Stop the quibbler agent and wait for task to complete"""
@@ -133,7 +173,9 @@ class Quibbler:
                 for block in message.content:
                     if isinstance(block, TextBlock):
                         feedback_parts.append(block.text)
-                        logger.info("review> extracted text: %s", block.text[:100])
+                        logger.info(
+                            "review> extracted text: %s", Truncated(block.text, 100)
+                        )
 
         return "".join(feedback_parts)
 
@@ -141,23 +183,21 @@ class Quibbler:
         """Send query to Claude and consume response (don't collect)"""
         await client.query(prompt)
         async for message in client.receive_response():
-            msg_type = type(message).__name__
-            logger.info("event> type=%s", msg_type)
+            logger.info("event> type=%s", type(message).__name__)
+
+            # Message content can be large - only walk and log it when debugging
+            if not logger.isEnabledFor(logging.DEBUG):
+                continue
 
-            # Log the actual content for debugging
             if isinstance(message, AssistantMessage):
                 for block in message.content:
                     if isinstance(block, TextBlock):
-                        logger.info(
-                            "event> ASSISTANT TEXT: %s", block.text[:500]
-                        )  # First 500 chars
+                        logger.debug(
+                            "event> ASSISTANT TEXT: %s", Truncated(block.text, 500)
+                        )
 
             # Log full message to see tool use
-            logger.info("event> FULL MESSAGE: %s", str(message)[:1000])
-
-    async def _send_startup_message(self, client: ClaudeSDKClient) -> None:
-        """Send startup message - subclasses must override"""
-        raise NotImplementedError("Subclasses must implement _send_startup_message")
+            logger.debug("event> FULL MESSAGE: %s", Truncated(message, 1000))
 
     async def _run_loop(self, client: ClaudeSDKClient) -> None:
         """Run the main processing loop - subclasses must override"""
@@ -169,9 +209,14 @@ class Quibbler:
         quibbler_dir = Path(self.source_path) / ".quibbler"
         quibbler_dir.mkdir(exist_ok=True)
 
-        # Prepare system prompt
-        system_prompt = self._prepare_system_prompt()
-        logger.info(f"Prepared system prompt preview: {system_prompt[:200]}...")
+        # Prepare system prompt once; restarts reuse the formatted result
+        if self._prepared_system_prompt is None:
+            self._prepared_system_prompt = self._prepare_system_prompt()
+            logger.info(
+                "Prepared system prompt preview: %s...",
+                Truncated(self._prepared_system_prompt, 200),
+            )
+        system_prompt = self._prepared_system_prompt
 
         options = ClaudeAgentOptions(
             cwd=self.source_path,
@@ -185,10 +230,8 @@ class Quibbler:
 
         try:
             async with ClaudeSDKClient(options=options) as client:
-                # Send startup message
-                await self._send_startup_message(client)
-
-                # Run the mode-specific loop
+                # The session instructions live in the system prompt, so go
+                # straight to the mode-specific loop without a startup query
                 await self._run_loop(client)
 
         except asyncio.CancelledError:
@@ -202,50 +245,96 @@ class Quibbler:
 class QuibblerMCP(Quibbler):
     """Quibbler agent for MCP mode - provides synchronous review responses"""
 
-    async def review(self, review_request: str) -> str:
+    queue: asyncio.Queue = field(
+        default_factory=lambda: asyncio.Queue(maxsize=MAX_PENDING_REVIEWS), init=False
+    )
+    _reviewing: bool = field(default=False, init=False)
+
+    def is_idle(self) -> bool:
+        """True when no review is queued or in progress"""
+        return self.queue.empty() and not self._reviewing
+
+    def submit(self, review_request: str) -> asyncio.Future[str]:
         """
-        Submit a review request and wait for feedback.
+        Enqueue a review request without waiting for it.
 
         Args:
             review_request: The formatted review request with user instructions and agent plan
 
         Returns:
-            The quibbler's feedback as a string
+            A future resolved with the quibbler's feedback
+
+        Raises:
+            RuntimeError: If MAX_PENDING_REVIEWS reviews are already waiting
         """
         # Create a future to receive the response
-        response_future = asyncio.Future()
+        response_future = asyncio.get_running_loop().create_future()
+
+        # Enqueue the request with its response future, failing fast when full
+        try:
+            self.queue.put_nowait((review_request, response_future))
+        except asyncio.QueueFull:
+            logger.warning("Review queue full for %s, rejecting", self.source_path)
+            raise RuntimeError(
+                f"Quibbler already has {MAX_PENDING_REVIEWS} pending reviews, retry later"
+            ) from None
+
+        return response_future
 
-        # Enqueue the request with its response future
-        await self.queue.put((review_request, response_future))
+    async def review(self, review_request: str) -> str:
+        """
+        Submit a review request and wait for feedback.
 
-        # Wait for the agent to process and respond
-        feedback = await response_future
+        Args:
+            review_request: The formatted review request with user instructions and agent plan
 
-        return feedback
+        Returns:
+            The quibbler's feedback as a string
 
-    async def _send_startup_message(self, client: ClaudeSDKClient) -> None:
-        """Send MCP-specific startup message"""
-        startup_msg = (
-            "Quibbler session started. You will receive code review requests AFTER changes have been made. "
-            "For each request, analyze the user's intent and the agent's completed changes. "
-            "Provide concise, actionable feedback or approval. Build understanding of the codebase over time."
-        )
+        Raises:
+            RuntimeError: If MAX_PENDING_REVIEWS reviews are already waiting
+        """
+        return await self.submit(review_request)
 
-        await client.query(startup_msg)
-        async for message in client.receive_response():
-            logger.info("startup> type=%s", type(message).__name__)
+    async def stop(self) -> None:
+        """Stop the agent, failing any reviews still waiting on it"""
+        await super().stop()
+        while not self.queue.empty():
+            _, response_future = self.queue.get_nowait()
+            if not response_future.done():
+                response_future.set_exception(
+                    RuntimeError("Quibbler was stopped before reviewing this request")
+                )
+            self.queue.task_done()
 
     async def _run_loop(self, client: ClaudeSDKClient) -> None:
         """Process MCP review requests (synchronous responses)"""
         while True:
             review_request, response_future = await self.queue.get()
+            if response_future.cancelled():
+                # The caller gave up while the request was waiting
+                self.queue.task_done()
+                continue
+
+            self._reviewing = True
             try:
                 feedback = await self._query_and_collect_text(client, review_request)
-                response_future.set_result(feedback)
+                # The caller may have cancelled while the review ran
+                if not response_future.done():
+                    response_future.set_result(feedback)
+            except asyncio.CancelledError:
+                # Stopped mid-review - don't leave the caller waiting forever
+                if not response_future.done():
+                    response_future.set_exception(
+                        RuntimeError("Quibbler was stopped before finishing this review")
+                    )
+                raise
             except Exception as e:
-                logger.error(f"Error processing review request: {e}")
-                response_future.set_exception(e)
+                logger.error("Error processing review request: %s", e)
+                if not response_future.done():
+                    response_future.set_exception(e)
             finally:
+                self._reviewing = False
                 self.queue.task_done()
 
 
@@ -255,41 +344,81 @@ class QuibblerHook(Quibbler):
 
     session_id: str = field(kw_only=True)
 
-    async def enqueue(self, evt: dict[str, Any]) -> None:
+    events: deque[dict[str, Any]] = field(
+        default_factory=lambda: deque(maxlen=MAX_PENDING_EVENTS), init=False
+    )
+    events_ready: asyncio.Event = field(default_factory=asyncio.Event, init=False)
+    _processing: bool = field(default=False, init=False)
+
+    def is_idle(self) -> bool:
+        """True when no events are waiting and no batch is in progress"""
+        return not self.events and not self._processing
+
+    def enqueue(self, evt: dict[str, Any]) -> None:
         """
-        Add a hook event to the processing queue.
+        Add a hook event to the processing queue without awaiting.
+
+        Once MAX_PENDING_EVENTS are waiting, the oldest one is dropped.
 
         Args:
             evt: The hook event dictionary to process
         """
-        await self.queue.put(evt)
+        if len(self.events) == self.events.maxlen:
+            logger.warning(
+                "Event queue full for session %s, dropping oldest", self.session_id
+            )
+        self.events.append(evt)
+        self.events_ready.set()
+
+    async def _next_batch(self) -> list[dict[str, Any]]:
+        """Wait for an event, then up to BATCH_WAIT_TIME for the batch to fill"""
+        while not self.events:
+            self.events_ready.clear()
+            await self.events_ready.wait()
+
+        deadline = time.monotonic() + BATCH_WAIT_TIME
+        while len(self.events) < MAX_BATCH_SIZE:
+            timeout = deadline - time.monotonic()
+            if timeout <= 0:
+                break
+            self.events_ready.clear()
+            try:
+                await asyncio.wait_for(self.events_ready.wait(), timeout)
+            except asyncio.TimeoutError:
+                break
+
+        count = min(len(self.events), MAX_BATCH_SIZE)
+        return [self.events.popleft() for _ in range(count)]
 
     def _prepare_system_prompt(self) -> str:
-        """Prepare system prompt with message file path"""
+        """
+        Prepare system prompt with message file path.
+
+        The session-specific path is appended at the very end so the rest of
+        the prompt stays byte-identical across sessions and can be served from
+        the prompt cache. Custom prompts written for the old template may
+        still contain a {message_file} placeholder, which is filled in too.
+        """
         quibbler_dir = Path(self.source_path) / ".quibbler"
         message_file = str(quibbler_dir / f"{self.session_id}.txt")
-        logger.info(f"Hook mode: feedback file = {message_file}")
-        return self.system_prompt.format(message_file=message_file)
-
-    async def _send_startup_message(self, client: ClaudeSDKClient) -> None:
-        """Send hook-specific startup message"""
-        startup_msg = (
-            "Quibbler session started. Watch the events and intervene when necessary. "
-            "Build understanding in your head."
+        logger.info("Hook mode: feedback file = %s", message_file)
+        system_prompt = self.system_prompt.replace("{message_file}", message_file)
+        return (
+            f"{system_prompt}\n\n## Feedback File\n\n"
+            f"Write your feedback for this session to: {message_file}\n"
         )
 
-        await client.query(startup_msg)
-        async for message in client.receive_response():
-            logger.info("startup> type=%s", type(message).__name__)
-
     async def _run_loop(self, client: ClaudeSDKClient) -> None:
-        """Process hook events (fire-and-forget)"""
+        """Process hook events (fire-and-forget), one query per batch of events"""
         while True:
-            evt = await self.queue.get()
+            batch = await self._next_batch()
+            self._processing = True
             try:
-                prompt = format_event_for_agent(evt)
+                prompt = "\n\n---\n\n".join(
+                    format_event_for_agent(evt) for evt in batch
+                )
                 await self._query_and_consume(client, prompt)
             except Exception as e:
-                logger.error(f"Error processing hook event: {e}")
+                logger.error("Error processing %s hook event(s): %s", len(batch), e)
             finally:
-                self.queue.task_done()
+                self._processing = False
@@ -1,24 +1,57 @@
 #!/usr/bin/env python3
 """Quibbler CLI - Main command-line interface"""
 
+import os
 import sys
 import json
 import argparse
 from pathlib import Path
 
-from quibbler.mcp_server import run_server as run_mcp_server
-from quibbler.hook_server import run_server as run_hook_server
-from quibbler.hook_forward import forward_hook
-from quibbler.hook_display import display_feedback
+# Subcommand modules are imported inside each cmd_* function: `hook forward`
+# and `hook notify` run on every Claude hook event and shouldn't pay for
+# importing the agent SDK, FastAPI or MCP
+
+# Hook entries written to .claude/settings.json by `quibbler hook add`
+_QUIBBLER_HOOKS = {
+    # PreToolUse: surface pending feedback before each tool call
+    "PreToolUse": [
+        {
+            "matcher": "*",
+            "hooks": [{"type": "command", "command": "quibbler hook notify"}],
+        }
+    ],
+    # PostToolUse: forward the tool call to the server, then surface feedback
+    "PostToolUse": [
+        {
+            "matcher": "*",
+            "hooks": [
+                {"type": "command", "command": "quibbler hook forward"},
+                {"type": "command", "command": "quibbler hook notify"},
+            ],
+        }
+    ],
+    "UserPromptSubmit": [
+        {
+            "matcher": "*",
+            "hooks": [{"type": "command", "command": "quibbler hook forward"}],
+        }
+    ],
+    # Stop: surface any remaining feedback
+    "Stop": [{"hooks": [{"type": "command", "command": "quibbler hook notify"}]}],
+}
 
 
 def cmd_mcp(args):
     """Run the MCP server via stdio"""
+    from quibbler.mcp_server import run_server as run_mcp_server
+
     run_mcp_server()
 
 
 def cmd_hook_server(args):
     """Run the hook server"""
+    from quibbler.hook_server import run_server as run_hook_server
+
     port = getattr(args, "port", None) or 8081
     run_hook_server(port=port)
 
@@ -29,66 +62,50 @@ def cmd_hook_add(args):
     claude_dir = Path.cwd() / ".claude"
     settings_file = claude_dir / "settings.json"
 
-    if not claude_dir.exists():
-        claude_dir.mkdir(parents=True, exist_ok=True)
-        print(f"Created {claude_dir}")
-
-    # Load existing settings or create new
-    if settings_file.exists():
-        with open(settings_file) as f:
-            settings = json.load(f)
-    else:
+    # Load existing settings or create new - opening directly saves the
+    # separate exists() checks
+    try:
+        with open(settings_file, "rb") as f:
+            current = f.read()
+        settings = json.loads(current)
+    except FileNotFoundError:
+        current = None
         settings = {}
-
-    # Ensure hooks section exists
-    if "hooks" not in settings:
-        settings["hooks"] = {}
-
-    # Add PreToolUse hook for quibbler hook notify
-    settings["hooks"]["PreToolUse"] = [
-        {
-            "matcher": "*",
-            "hooks": [{"type": "command", "command": "quibbler hook notify"}],
-        }
-    ]
-
-    # Add PostToolUse hook for quibbler hook forward and notify
-    settings["hooks"]["PostToolUse"] = [
-        {
-            "matcher": "*",
-            "hooks": [
-                {"type": "command", "command": "quibbler hook forward"},
-                {"type": "command", "command": "quibbler hook notify"},
-            ],
-        }
-    ]
-
-    settings["hooks"]["UserPromptSubmit"] = [
-        {
-            "matcher": "*",
-            "hooks": [{"type": "command", "command": "quibbler hook forward"}],
-        }
-    ]
-
-    # Add Stop hook for quibbler hook notify
-    settings["hooks"]["Stop"] = [
-        {"hooks": [{"type": "command", "command": "quibbler hook notify"}]}
-    ]
-
-    # Write back to file
-    with open(settings_file, "w") as f:
-        json.dump(settings, f, indent=2)
+        try:
+            claude_dir.mkdir(parents=True)
+            print(f"Created {claude_dir}")
+        except FileExistsError:
+            pass
+
+    # Add (or replace) the quibbler hook entries
+    settings.setdefault("hooks", {}).update(_QUIBBLER_HOOKS)
+
+    # Skip the write when the hooks are already in place
+    updated = json.dumps(settings, indent=2).encode("utf-8")
+    if updated == current:
+        print(f"✓ Quibbler hooks already present in {settings_file}")
+        return
+
+    # Write to a temp file and rename, so readers never see a partial file
+    tmp_file = settings_file.with_name(settings_file.name + ".tmp")
+    with open(tmp_file, "wb") as f:
+        f.write(updated)
+    os.replace(tmp_file, settings_file)
 
     print(f"✓ Added quibbler hooks to {settings_file}")
 
 
 def cmd_hook_forward(args):
     """Forward hook events to the server"""
+    from quibbler.hook_forward import forward_hook
+
     sys.exit(forward_hook())
 
 
 def cmd_hook_notify(args):
     """Display quibbler feedback to the agent"""
+    from quibbler.hook_display import display_feedback
+
     sys.exit(display_feedback())
 
 
@@ -4,24 +4,54 @@ Display hook for quibbler feedback.
 
 This script:
 1. Reads hook event JSON from stdin to extract session_id
-2. Checks if .quibbler/$session_id.txt exists in the current working directory
-3. If exists: reads contents, prints to stderr, deletes file
-4. If not exists: exits silently
+2. Opens .quibbler/$session_id.txt in the current working directory
+3. If it opens: copies contents to stderr, deletes file
+4. If it is missing: exits silently
 
 This is designed to be called as a hook to display quibbler feedback to the agent.
 Output to stderr ensures the feedback is visible in the agent's context.
 """
 
 import json
+import os
 import sys
-from pathlib import Path
+
+
+_SEPARATOR = b"=" * 80 + b"\n"
+_HEADER = _SEPARATOR + b"QUIBBLER FEEDBACK\n" + _SEPARATOR
+_READ_SIZE = 128 * 1024
+_FEEDBACK_DIR = ".quibbler"
+
+
+def _write_all(fd: int, data: bytes) -> None:
+    """Write `data` to `fd`, retrying on short writes"""
+    view = memoryview(data)
+    while view:
+        view = view[os.write(fd, view) :]
+
+
+def _copy_fd(src: int, dst: int) -> None:
+    """Copy the rest of `src` to `dst`, kernel-side where the platform allows it"""
+    offset = 0
+    if sys.platform == "linux":
+        try:
+            while sent := os.sendfile(dst, src, offset, _READ_SIZE):
+                offset += sent
+            return
+        except OSError:
+            # e.g. an output fd sendfile can't write to - finish with read/write
+            os.lseek(src, offset, os.SEEK_SET)
+
+    while chunk := os.read(src, _READ_SIZE):
+        _write_all(dst, chunk)
 
 
 def display_feedback() -> int:
     """Display quibbler feedback to the agent"""
-    # Read hook event from stdin to extract session_id
-    hook_input = sys.stdin.read().strip()
-    if not hook_input:
+    # Read hook event from stdin as bytes to extract session_id - json.loads
+    # decodes UTF-8 itself, so skip the text layer
+    hook_input = sys.stdin.buffer.read()
+    if not hook_input.strip():
         return 0
 
     hook_event = json.loads(hook_input)
@@ -30,21 +60,24 @@ def display_feedback() -> int:
         return 0
 
     # Look for session-specific quibbler feedback file in .quibbler directory
-    quibbler_file = Path.cwd() / ".quibbler" / f"{session_id}.txt"
-    if not quibbler_file.exists():
+    # (relative to the working directory, which saves resolving it)
+    quibbler_file = os.path.join(_FEEDBACK_DIR, f"{session_id}.txt")
+    try:
+        fd = os.open(quibbler_file, os.O_RDONLY)
+    except FileNotFoundError:
         return 0
 
-    # Read the quibbler feedback
-    feedback = quibbler_file.read_text()
-
-    # Print to stderr so it's fed back to the agent
-    print("=" * 80, file=sys.stderr)
-    print("QUIBBLER FEEDBACK", file=sys.stderr)
-    print("=" * 80, file=sys.stderr)
-    print(feedback, file=sys.stderr)
-    print("=" * 80, file=sys.stderr)
+    # Copy the feedback to stderr so it's fed back to the agent, without
+    # reading it into Python
+    stderr_fd = sys.stderr.fileno()
+    try:
+        _write_all(stderr_fd, _HEADER)
+        _copy_fd(fd, stderr_fd)
+        _write_all(stderr_fd, b"\n" + _SEPARATOR)
+    finally:
+        os.close(fd)
 
     # Delete the file after displaying
-    quibbler_file.unlink()
+    os.unlink(quibbler_file)
 
     return 2
@@ -1,21 +1,102 @@
 #!/usr/bin/env python3
 """
-Read hook JSON from stdin and POST to /hook/<session_id>
-Session ID is passed as the first argument
+Read hook JSON from stdin and forward it to the quibbler server.
+
+Events are sent as a single datagram to the server's Unix socket; the HTTP
+POST to /hook/<session_id> is only used when the socket is unavailable.
+
+Optional environment:
+  QUIBBLER_MONITOR_BASE=http://127.0.0.1:8081  # Server base URL for the HTTP fallback
+  QUIBBLER_MONITOR_SOCKET=...  # Server socket; defaults to ~/.quibbler/hook-<port>.sock
+                               # when the base URL is local, otherwise HTTP only
 """
 
+import ipaddress
 import json
 import os
+import socket
 import sys
-from urllib.parse import quote
+from http.client import HTTPConnection, HTTPException, HTTPSConnection
+from pathlib import Path
+from urllib.parse import quote, urlsplit
 
-import requests
-
-from quibbler.logger import get_logger
+from quibbler.logger import LOG_DIR, get_logger
 
 
 logger = get_logger(__name__)
 
+DEFAULT_PORT = 8081
+
+# Larger envelopes go over HTTP so a datagram is never truncated by the reader
+MAX_DATAGRAM_SIZE = 64 * 1024
+
+_ENVELOPE_TEMPLATE = (
+    b'{"event": %s, "receivedAt": %s, "payload": %s, "source_path": %s}'
+)
+
+
+def _encode(value: object) -> bytes:
+    """Encode a single envelope field as UTF-8 JSON"""
+    return json.dumps(value, ensure_ascii=False).encode("utf-8")
+
+
+def hook_socket_path(port: int = DEFAULT_PORT) -> Path:
+    """Path of the datagram socket served by the hook server on `port`"""
+    return LOG_DIR / f"hook-{port}.sock"
+
+
+def _local_socket_path(base: str) -> str | None:
+    """Datagram socket to try for `base`, or None if the server is not local"""
+    explicit = os.getenv("QUIBBLER_MONITOR_SOCKET")
+    if explicit:
+        return explicit
+
+    parts = urlsplit(base)
+    if parts.hostname != "localhost":
+        try:
+            if not ipaddress.ip_address(parts.hostname or "").is_loopback:
+                return None
+        except ValueError:
+            return None
+
+    return str(hook_socket_path(parts.port or DEFAULT_PORT))
+
+
+def _send_datagram(socket_path: str, body: bytes) -> bool:
+    """Send the envelope to the server socket, returning False if it is unavailable"""
+    if not hasattr(socket, "AF_UNIX") or len(body) > MAX_DATAGRAM_SIZE:
+        return False
+
+    try:
+        with socket.socket(socket.AF_UNIX, socket.SOCK_DGRAM) as sock:
+            sock.setsockopt(socket.SOL_SOCKET, socket.SO_SNDBUF, MAX_DATAGRAM_SIZE)
+            sock.settimeout(1.0)
+            sock.sendto(body, socket_path)
+    except OSError as e:
+        logger.info("Socket %s unavailable, falling back to HTTP: %s", socket_path, e)
+        return False
+
+    return True
+
+
+def _post_envelope(base: str, session_id: str, body: bytes) -> int:
+    """POST the envelope to /hook/<session_id> and return the response status"""
+    parts = urlsplit(base)
+    connection_cls = HTTPSConnection if parts.scheme == "https" else HTTPConnection
+    conn = connection_cls(parts.hostname, parts.port, timeout=10)
+    path = f"{parts.path.rstrip('/')}/hook/{quote(session_id, safe='')}"
+
+    try:
+        conn.request(
+            "POST", path, body=body, headers={"Content-Type": "application/json"}
+        )
+        response = conn.getresponse()
+        response.read()
+    finally:
+        conn.close()
+
+    return response.status
+
 
 def forward_hook() -> int:
     """Forward hook events to the quibbler server"""
@@ -25,57 +106,69 @@ def forward_hook() -> int:
         logger.info("Skipping forward (CLAUDE_MONITOR_SKIP_FORWARD=1)")
         return 0
 
-    # Read hook JSON from stdin
+    # Read hook JSON from stdin as bytes - json.loads decodes UTF-8 itself
     try:
         logger.info("Reading from stdin...")
-        raw = sys.stdin.read()
-        logger.info(f"Read {len(raw)} bytes from stdin")
+        raw = sys.stdin.buffer.read()
+        logger.info("Read %s bytes from stdin", len(raw))
 
         if not raw:
             logger.error("Empty stdin - no data to forward")
             return 1
 
         payload = json.loads(raw)
-        logger.info(f"Parsed JSON successfully: {list(payload.keys())}")
+        logger.info("Parsed JSON successfully: %s", list(payload.keys()))
     except json.JSONDecodeError as e:
-        logger.error(f"Invalid stdin JSON: {e}")
-        logger.error(f"Raw input (first 200 chars): {raw[:200]}")
+        logger.error("Invalid stdin JSON: %s", e)
+        logger.error("Raw input (first 200 bytes): %r", raw[:200])
         return 1
     except Exception as e:
-        logger.error(f"Unexpected error reading stdin: {e}", exc_info=True)
+        logger.error("Unexpected error reading stdin: %s", e, exc_info=True)
         return 1
 
     session_id = payload.get("session_id")
     source_path = os.getcwd()
 
-    logger.info(f"Session ID: {session_id}")
-    logger.info(f"Source path: {source_path}")
+    logger.info("Session ID: %s", session_id)
+    logger.info("Source path: %s", source_path)
 
-    base = os.getenv("QUIBBLER_MONITOR_BASE", "http://127.0.0.1:8081")
-    session_id_enc = quote(session_id, safe="")
-    url = f"{base.rstrip('/')}/hook/{session_id_enc}"
+    base = os.getenv("QUIBBLER_MONITOR_BASE", f"http://127.0.0.1:{DEFAULT_PORT}")
 
-    envelope = {
-        "event": payload.get("hook_event_name", "UnknownEvent"),
-        "receivedAt": payload.get("timestamp") or payload.get("time"),
-        "payload": payload,
-        "source_path": source_path,
-    }
+    event = payload.get("hook_event_name", "UnknownEvent")
+    received_at = payload.get("timestamp") or payload.get("time")
+
+    # The payload is already valid JSON, so splice the raw bytes in as-is
+    # instead of re-serializing the parsed dict
+    body = _ENVELOPE_TEMPLATE % (
+        _encode(event),
+        _encode(received_at),
+        raw,
+        _encode(source_path),
+    )
+
+    socket_path = _local_socket_path(base)
+    if socket_path is not None and _send_datagram(socket_path, body):
+        logger.info("Forwarded %s to %s", event, socket_path)
+        logger.info("=== Hook forward completed successfully ===")
+        return 0
 
     try:
-        logger.info(f"Forwarding {envelope['event']} to {url}")
-        response = requests.post(url, json=envelope, timeout=10)
-        response.raise_for_status()
-        logger.info(f"Successfully forwarded to server: {response.status_code}")
-    except requests.exceptions.Timeout as e:
-        logger.error(f"Timeout forwarding hook (10s): {e}")
+        logger.info("Forwarding %s to %s", event, base)
+        status = _post_envelope(base, session_id, body)
+    except TimeoutError as e:
+        logger.error("Timeout forwarding hook (10s): %s", e)
+        return 1
+    except ConnectionError as e:
+        logger.error("Connection error forwarding hook: %s", e)
         return 1
-    except requests.exceptions.ConnectionError as e:
-        logger.error(f"Connection error forwarding hook: {e}")
+    except (HTTPException, OSError) as e:
+        logger.error("Failed to forward hook: %s", e, exc_info=True)
         return 1
-    except requests.exceptions.RequestException as e:
-        logger.error(f"Failed to forward hook: {e}", exc_info=True)
+
+    if status >= 400:
+        logger.error("Server rejected hook: HTTP %s", status)
         return 1
+    logger.info("Successfully forwarded to server: %s", status)
 
     logger.info("=== Hook forward completed successfully ===")
     return 0
@@ -4,11 +4,16 @@ Quibbler server - receives hook events and routes them to quibbler agents.
 
 Optional environment:
   ANTHROPIC_API_KEY=...  # Optional - Claude SDK supports auto-login with Claude Code/Max accounts
+  QUIBBLER_MAX_AGENTS=64  # Max live agents (one per session); least recently used idle one is stopped
 
 Run:
   quibbler server [port]
 
   Default port: 8081
+
+Hook events arrive as datagrams on ~/.quibbler/hook-<port>.sock, or as HTTP
+POSTs to /hook/<session_id>; see quibbler.hook_forward for the client side
+(QUIBBLER_MONITOR_BASE, QUIBBLER_MONITOR_SOCKET).
 """
 
 from __future__ import annotations
@@ -16,31 +21,144 @@ from __future__ import annotations
 import asyncio
 import json
 import os
+import socket
+from collections import OrderedDict
 from contextlib import asynccontextmanager
 from datetime import datetime, timezone
+from pathlib import Path
 from typing import Any
 
 import uvicorn
 from fastapi import FastAPI, HTTPException, Request
 
-from quibbler.agent import QuibblerHook, load_config
+from quibbler.agent import QuibblerHook, load_config, max_agents_from_env
+from quibbler.hook_forward import hook_socket_path
 from quibbler.prompts import load_prompt
 from quibbler.logger import get_logger
 
 logger = get_logger(__name__)
 
-# session_id -> QuibblerHook
-_quibblers: dict[str, QuibblerHook] = {}
+# Datagrams waiting to be routed; beyond this new ones are dropped
+MAX_PENDING_DATAGRAMS = 1024
+
+# Cap on live quibblers; past it the least recently used idle session is stopped
+MAX_QUIBBLERS = max_agents_from_env(default=64)
+
+# session_id -> QuibblerHook, least recently used first
+_quibblers: OrderedDict[str, QuibblerHook] = OrderedDict()
+
+# Stops of evicted quibblers, kept referenced until they finish
+_stopping: set[asyncio.Task] = set()
+
+
+class _HookDatagramProtocol(asyncio.DatagramProtocol):
+    """Receives forwarded hook envelopes on the Unix datagram socket"""
+
+    def __init__(self, queue: asyncio.Queue[bytes]):
+        self.queue = queue
+
+    def datagram_received(self, data: bytes, addr: Any) -> None:
+        try:
+            self.queue.put_nowait(data)
+        except asyncio.QueueFull:
+            logger.warning("Datagram queue full, dropping hook event")
+
+
+async def _flush_datagrams(queue: asyncio.Queue[bytes]) -> None:
+    """Route datagram envelopes to their session quibblers as they arrive"""
+    # Events are coalesced into agent queries by QuibblerHook, not here
+    while True:
+        raw = await queue.get()
+        # A bad datagram must never end this task - the forwarder can't tell
+        # and every later event would be silently lost
+        try:
+            data = json.loads(raw)
+            if not isinstance(data, dict) or not isinstance(
+                data.get("payload"), dict
+            ):
+                logger.error("Dropping datagram that is not an event envelope")
+                continue
+
+            session_id = data["payload"].get("session_id")
+            source_path = data.get("source_path")
+            if not session_id or not source_path:
+                logger.error("Dropping datagram without session_id or source_path")
+                continue
+
+            evt = _make_event(data)
+            await _route_event(session_id, source_path, evt)
+        except json.JSONDecodeError as e:
+            logger.error("Dropping malformed datagram: %s", e)
+        except Exception:
+            logger.exception("Error routing hook datagram")
+
+
+def _bind_hook_socket(socket_path: Path) -> socket.socket | None:
+    """Bind the hook datagram socket, or return None if another server owns it"""
+    if socket_path.exists():
+        probe = socket.socket(socket.AF_UNIX, socket.SOCK_DGRAM)
+        try:
+            probe.connect(str(socket_path))
+        except ConnectionRefusedError:
+            # Left behind by a server that exited without cleaning up
+            socket_path.unlink(missing_ok=True)
+        else:
+            logger.warning(
+                "Hook socket %s is in use by another server, accepting HTTP only",
+                socket_path,
+            )
+            return None
+        finally:
+            probe.close()
+
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_DGRAM)
+    try:
+        sock.bind(str(socket_path))
+    except OSError:
+        sock.close()
+        raise
+    return sock
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """Lifespan context manager for startup and shutdown"""
+    transport = None
+    flush_task = None
+    socket_path = getattr(app.state, "socket_path", None)
+
+    if socket_path is not None and hasattr(socket, "AF_UNIX"):
+        try:
+            sock = _bind_hook_socket(socket_path)
+        except OSError as e:
+            logger.warning(
+                "Could not bind hook socket %s (%s), accepting HTTP only", socket_path, e
+            )
+            sock = None
+
+        if sock is not None:
+            queue: asyncio.Queue[bytes] = asyncio.Queue(maxsize=MAX_PENDING_DATAGRAMS)
+            transport, _ = await asyncio.get_running_loop().create_datagram_endpoint(
+                lambda: _HookDatagramProtocol(queue), sock=sock
+            )
+            flush_task = asyncio.create_task(_flush_datagrams(queue))
+            logger.info("Listening for hook datagrams on %s", socket_path)
+
     yield
-    # Shutdown: clean up all quibblers
-    for sid, c in list(_quibblers.items()):
-        await c.stop()
-        _quibblers.pop(sid, None)
+
+    if transport is not None:
+        transport.close()
+        flush_task.cancel()
+        socket_path.unlink(missing_ok=True)
+
+    # Shutdown: stop all quibblers concurrently, along with any evicted ones
+    # still stopping
+    await asyncio.gather(
+        *(quibbler.stop() for quibbler in _quibblers.values()),
+        *_stopping,
+        return_exceptions=True,
+    )
+    _quibblers.clear()
 
 
 app = FastAPI(title="Quibbler Server", version="1.0", lifespan=lifespan)
@@ -62,19 +180,54 @@ async def get_or_create_quibbler(session_id: str, source_path: str) -> QuibblerH
         await quibbler.start()
         _quibblers[session_id] = quibbler
         logger.info("started quibbler for session_id=%s in %s", session_id, source_path)
+        _evict_idle_quibblers(keep=session_id)
+    else:
+        _quibblers.move_to_end(session_id)
 
     return quibbler
 
 
-async def _process_event_in_background(
-    session_id: str, source_path: str, evt: dict[str, Any]
-) -> None:
-    """Process event in background without blocking the HTTP response"""
+def _evict_idle_quibblers(keep: str) -> None:
+    """
+    Stop least recently used idle quibblers beyond MAX_QUIBBLERS without waiting.
+
+    Sessions with events waiting or a batch in progress are never evicted, nor
+    is `keep` - the one just created for the incoming event - so the cap can
+    be exceeded while that many sessions are busy.
+    """
+    excess = len(_quibblers) - MAX_QUIBBLERS
+    if excess <= 0:
+        return
+
+    idle = [
+        session_id
+        for session_id, quibbler in _quibblers.items()
+        if session_id != keep and quibbler.is_idle()
+    ]
+    for session_id in idle[:excess]:
+        quibbler = _quibblers.pop(session_id)
+        logger.info("Evicting idle quibbler for session_id=%s", session_id)
+        task = asyncio.create_task(quibbler.stop())
+        _stopping.add(task)
+        task.add_done_callback(_stopping.discard)
+
+
+async def _route_event(session_id: str, source_path: str, evt: dict[str, Any]) -> None:
+    """Hand an event to its session's quibbler, creating the quibbler if needed"""
     try:
         quibbler = await get_or_create_quibbler(session_id, source_path)
-        await quibbler.enqueue(evt)
+        quibbler.enqueue(evt)
     except Exception as e:
-        logger.error(f"Error processing event for session {session_id}: {e}")
+        logger.error("Error processing event for session %s: %s", session_id, e)
+
+
+def _make_event(data: dict[str, Any]) -> dict[str, Any]:
+    """Stamp the parsed envelope with its received timestamp, in place"""
+    # The envelope is freshly parsed and owned by this event, so mutate it
+    # instead of copying every key into a new dict
+    if "received_at" not in data:
+        data["received_at"] = datetime.now(timezone.utc).isoformat()
+    return data
 
 
 @app.post("/hook/{session_id}")
@@ -82,7 +235,8 @@ async def hook(request: Request, session_id: str) -> dict[str, str]:
     """Receive hook events and route to appropriate quibbler"""
     body = await request.body()
 
-    data = json.loads(body.decode("utf-8"))
+    # json.loads detects and decodes UTF-8 bytes itself
+    data = json.loads(body)
 
     if not session_id:
         raise HTTPException(status_code=400, detail="session_id is required")
@@ -91,19 +245,16 @@ async def hook(request: Request, session_id: str) -> dict[str, str]:
     if not source_path:
         raise HTTPException(status_code=400, detail="source_path is required")
 
-    # Create clean event with received timestamp
-    evt = {
-        "received_at": datetime.now(timezone.utc).isoformat(),
-        **data,
-    }
+    evt = _make_event(data)
 
     event_type = evt.get("event", "UnknownEvent")
     logger.info(
-        f"Received event {event_type} for session {session_id} in {source_path}"
+        "Received event %s for session %s in %s", event_type, session_id, source_path
     )
 
-    # Process in background - don't block the response
-    asyncio.create_task(_process_event_in_background(session_id, source_path, evt))
+    # Route inline: enqueueing never waits on the agent, and creating a
+    # quibbler only schedules its task, so this doesn't hold up the response
+    await _route_event(session_id, source_path, evt)
 
     return {"status": "ok", "session_id": session_id}
 
@@ -113,8 +264,13 @@ def run_server(port: int = 8081):
     # Prevent the quibbler agent itself from triggering hooks (would create infinite loop)
     os.environ["CLAUDE_MONITOR_SKIP_FORWARD"] = "1"
 
-    logger.info(f"Starting Quibbler Server on port {port}")
-    logger.info(f"Hook endpoint: http://0.0.0.0:{port}/hook/{{session_id}}")
+    app.state.socket_path = hook_socket_path(port)
+
+    logger.info("Starting Quibbler Server on port %s", port)
+    logger.info("Hook endpoint: http://0.0.0.0:%s/hook/{session_id}", port)
+    logger.info("Hook socket: %s", app.state.socket_path)
     logger.info("Feedback written to: quibbler-{{session_id}}.txt")
 
-    uvicorn.run(app, host="127.0.0.1", port=port, log_level="info")
+    # loop/http default to "auto", which already picks uvloop and httptools
+    # when they are installed; the per-request access log line is dropped
+    uvicorn.run(app, host="127.0.0.1", port=port, log_level="info", access_log=False)
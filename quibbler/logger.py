@@ -1,16 +1,106 @@
+import atexit
 import logging
+import queue
+from functools import cache
+from logging.handlers import QueueHandler, QueueListener
 from pathlib import Path
 
 
 LOG_DIR = Path.home() / ".quibbler"
 LOG_FILE = LOG_DIR / "quibbler.log"
+LOG_BUFFER_SIZE = 128 * 1024
 
+_FORMATTER = logging.Formatter(
+    "%(asctime)s - %(name)s - %(levelname)s - %(message)s",
+    datefmt="%Y-%m-%d %H:%M:%S",
+)
 
+
+class BufferedFileHandler(logging.FileHandler):
+    """
+    FileHandler that writes through a large userspace buffer.
+
+    StreamHandler flushes after every record; here records are only written
+    to the buffer, which is flushed when it fills, when the listener's queue
+    drains, and when logging shuts down.
+    """
+
+    def _open(self):
+        return open(
+            self.baseFilename,
+            self.mode,
+            buffering=LOG_BUFFER_SIZE,
+            encoding=self.encoding,
+            errors=self.errors,
+        )
+
+    def emit(self, record: logging.LogRecord) -> None:
+        # FileHandler.emit without the per-record flush
+        if self.stream is None:
+            if self.mode != "w" or not self._closed:
+                self.stream = self._open()
+        if self.stream:
+            try:
+                self.stream.write(self.format(record) + self.terminator)
+            except RecursionError:
+                raise
+            except Exception:
+                self.handleError(record)
+
+
+class _FlushingQueueListener(QueueListener):
+    """QueueListener that flushes its handlers whenever the queue runs empty"""
+
+    def dequeue(self, block: bool) -> logging.LogRecord:
+        if block and self.queue.empty():
+            # a burst is done - make it visible before waiting for the next
+            for handler in self.handlers:
+                handler.flush()
+        return super().dequeue(block)
+
+
+class Truncated:
+    """Log argument that is only converted and sliced if the record is emitted"""
+
+    __slots__ = ("value", "limit")
+
+    def __init__(self, value: object, limit: int):
+        self.value = value
+        self.limit = limit
+
+    def __str__(self) -> str:
+        return str(self.value)[: self.limit]
+
+
+@cache
 def create_log_dir() -> None:
-    """Create log directory idempotently."""
+    """Create log directory idempotently, once per process."""
     LOG_DIR.mkdir(parents=True, exist_ok=True)
 
 
+@cache
+def _queue_handler() -> QueueHandler:
+    """
+    Handler shared by all quibbler loggers, feeding a background listener thread.
+
+    Records are handed off with a queue put, so the file writes (and the
+    flush once the queue drains) never run on the caller's thread - in the servers,
+    the event loop. The one file handler behind it keeps a single descriptor
+    open for the whole process.
+    """
+    create_log_dir()
+    file_handler = BufferedFileHandler(LOG_FILE)
+    file_handler.setFormatter(_FORMATTER)
+
+    log_queue = queue.SimpleQueue()
+    listener = _FlushingQueueListener(log_queue, file_handler)
+    listener.start()
+    # drain the queue before logging's own shutdown closes the file
+    atexit.register(listener.stop)
+
+    return QueueHandler(log_queue)
+
+
 def get_logger(name: str, level: int = logging.INFO) -> logging.Logger:
     """Get a logger instance with name `name`."""
 
@@ -27,13 +117,7 @@ def get_logger(name: str, level: int = logging.INFO) -> logging.Logger:
     # otherwise, configure logger
     logger.setLevel(level)
     logger.propagate = False  # avoid duplicate logs from parent loggers
-    file_handler = logging.FileHandler(LOG_FILE)
-    file_handler.setLevel(level)
-    formatter = logging.Formatter(
-        "%(asctime)s - %(name)s - %(levelname)s - %(message)s",
-        datefmt="%Y-%m-%d %H:%M:%S",
-    )
-    file_handler.setFormatter(formatter)
-    logger.addHandler(file_handler)
+    # the handler is shared, so levels are filtered on the logger alone
+    logger.addHandler(_queue_handler())
 
     return logger
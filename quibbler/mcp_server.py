@@ -4,6 +4,7 @@ Quibbler MCP server - exposes review_code tool for agents to call before making
 
 Optional environment:
   ANTHROPIC_API_KEY=...  # Optional - Claude SDK supports auto-login with Claude Code/Max accounts
+  QUIBBLER_MAX_AGENTS=8  # Max live agents (one per project); least recently used idle one is stopped
 
 The MCP client spawns this server automatically via stdio.
 """
@@ -11,21 +12,52 @@ The MCP client spawns this server automatically via stdio.
 from __future__ import annotations
 
 import asyncio
+import time
+from collections import OrderedDict
 from textwrap import dedent
 
 from mcp.server.fastmcp import FastMCP
-from mcp.server.stdio import stdio_server
 
-from quibbler.agent import QuibblerMCP, load_config
-from quibbler.logger import get_logger
+from quibbler.agent import QuibblerMCP, load_config, max_agents_from_env
+from quibbler.logger import Truncated, get_logger
 from quibbler.prompts import load_prompt
 
 
 logger = get_logger(__name__)
 
 
-# project_path -> QuibblerMCP
-_quibblers: dict[str, QuibblerMCP] = {}
+# Cap on live quibblers; past it the least recently used idle project's is stopped
+MAX_QUIBBLERS = max_agents_from_env(default=8)
+
+# project_path -> QuibblerMCP, least recently used first
+_quibblers: OrderedDict[str, QuibblerMCP] = OrderedDict()
+
+# Stops of evicted quibblers, kept referenced until they finish
+_stopping: set[asyncio.Task] = set()
+
+
+# Dedented once here; dedenting per call also broke whenever the inserted text
+# had lines with less indentation than the template
+_REVIEW_REQUEST_TEMPLATE = dedent(
+    """
+    ## Review Request
+
+    **User Instructions:**
+    {user_instructions}
+
+    **Agent's Completed Changes:**
+    {agent_plan}
+
+    Please review the implemented changes. Check for:
+    - Do they address what the user actually asked for?
+    - Any hallucinated claims or assumptions in the implementation?
+    - Pattern violations or inconsistencies?
+    - Missing verification steps?
+    - Inappropriate shortcuts or mocking?
+
+    Provide concise, actionable feedback or approval.
+    """
+).strip()
 
 
 app = FastMCP("quibbler")
@@ -46,10 +78,38 @@ async def get_or_create_quibbler(project_path: str) -> QuibblerMCP:
         await quibbler.start()
         _quibblers[project_path] = quibbler
         logger.info("started quibbler for project: %s", project_path)
+        _evict_idle_quibblers(keep=project_path)
+    else:
+        _quibblers.move_to_end(project_path)
 
     return quibbler
 
 
+def _evict_idle_quibblers(keep: str) -> None:
+    """
+    Stop least recently used idle quibblers beyond MAX_QUIBBLERS without waiting.
+
+    Quibblers with reviews queued or in progress are never evicted, nor is
+    `keep` - the one just created for a review about to be submitted - so
+    the cap can be exceeded while that many projects are busy.
+    """
+    excess = len(_quibblers) - MAX_QUIBBLERS
+    if excess <= 0:
+        return
+
+    idle = [
+        project_path
+        for project_path, quibbler in _quibblers.items()
+        if project_path != keep and quibbler.is_idle()
+    ]
+    for project_path in idle[:excess]:
+        quibbler = _quibblers.pop(project_path)
+        logger.info("Evicting idle quibbler for project: %s", project_path)
+        task = asyncio.create_task(quibbler.stop())
+        _stopping.add(task)
+        task.add_done_callback(_stopping.discard)
+
+
 @app.tool()
 async def review_code(
     user_instructions: str,
@@ -66,46 +126,53 @@ async def review_code(
         agent_plan: A summary of the specific code changes you made. Include which files were modified, what was added/changed, and key implementation details. NOT just a general description - be concrete and detailed.
         project_path: Absolute path to the project directory
     """
-    logger.info("Review requested for project: %s", project_path)
-    logger.info("User instructions: %s", user_instructions)
-    logger.info("Agent plan: %s", agent_plan)
+    # Name the missing argument, so the caller can resend just that
+    if not user_instructions:
+        raise ValueError("user_instructions is required")
+    if not agent_plan:
+        raise ValueError("agent_plan is required")
+    if not project_path:
+        raise ValueError("project_path is required")
+
+    started = time.monotonic()
+    logger.info(
+        "Review requested for project: %s\nUser instructions: %s\nAgent plan: %s",
+        project_path,
+        user_instructions,
+        agent_plan,
+    )
 
     # Get or create persistent quibbler for this project
     quibbler = await get_or_create_quibbler(project_path)
 
     # Format review request
-    review_request = dedent(
-        f"""
-        ## Review Request
-
-        **User Instructions:**
-        {user_instructions}
-
-        **Agent's Completed Changes:**
-        {agent_plan}
-
-        Please review the implemented changes. Check for:
-        - Do they address what the user actually asked for?
-        - Any hallucinated claims or assumptions in the implementation?
-        - Pattern violations or inconsistencies?
-        - Missing verification steps?
-        - Inappropriate shortcuts or mocking?
-
-        Provide concise, actionable feedback or approval.
-        """
-    ).strip()
+    review_request = _REVIEW_REQUEST_TEMPLATE.format(
+        user_instructions=user_instructions, agent_plan=agent_plan
+    )
 
     # Enqueue review and wait for feedback
     feedback = await quibbler.review(review_request)
 
+    logger.info(
+        "Review finished for project: %s in %.0f ms\nFeedback: %s",
+        project_path,
+        (time.monotonic() - started) * 1000,
+        Truncated(feedback, 500),
+    )
+
     return feedback
 
 
 async def cleanup():
     """Cleanup all quibbler agents on shutdown"""
-    for project_path, quibbler in list(_quibblers.items()):
-        await quibbler.stop()
-        _quibblers.pop(project_path, None)
+    # Stop concurrently, so shutdown takes as long as the slowest agent, and
+    # wait for any evicted ones still stopping
+    await asyncio.gather(
+        *(quibbler.stop() for quibbler in _quibblers.values()),
+        *_stopping,
+        return_exceptions=True,
+    )
+    _quibblers.clear()
     logger.info("Cleaned up all quibbler agents")
 
 
@@ -1,5 +1,8 @@
 """Prompt templates for the quibbler agent"""
 
+import os
+import re
+from functools import lru_cache
 from pathlib import Path
 from textwrap import dedent
 from typing import Literal
@@ -9,6 +12,13 @@ from quibbler.logger import get_logger
 
 logger = get_logger(__name__)
 
+GLOBAL_PROMPT_PATH = Path.home() / ".quibbler" / "prompt.md"
+
+# Larger rules files are listed in the prompt by title only; the agent reads
+# the full file with its Read tool when a rule is relevant
+MAX_INLINE_RULES_SIZE = 8 * 1024
+_RULE_TITLE_RE = re.compile(r"^### Rule:[ \t]*(.*)$", re.MULTILINE)
+
 
 QUIBBLER_BASE_INSTRUCTIONS = dedent(
     """
@@ -111,9 +121,10 @@ HOOK_MODE_INSTRUCTIONS = dedent(
     You are observing agent actions as hook events in **hook mode**:
     - **Actively monitor** - Watch events and look for quality issues
     - **Intervene frequently** - Challenge assumptions, verify claims, catch shortcuts
-    - **Write feedback to {message_file}** using the Write tool whenever you see issues
+    - **Write feedback to the feedback file** named at the end of these instructions, using the Write tool, whenever you see issues
     - Be aggressive about intervention - it's better to over-communicate than under-communicate
     - Keep feedback concise and actionable
+    - Build understanding of the codebase in your head as events arrive
 
     ### Feedback Format
 
@@ -145,6 +156,8 @@ MCP_MODE_INSTRUCTIONS = dedent(
     You receive structured review requests with "User Instructions" and "Agent Changes" in **MCP mode**:
     - **Return concise, actionable feedback directly** in your response
     - Your response IS the feedback that goes back to the agent immediately
+    - For each request, analyze the user's intent against the agent's completed changes
+    - Build understanding of the codebase over time across requests
 
     ### Feedback Format
 
@@ -181,6 +194,74 @@ MCP_MODE_INSTRUCTIONS = dedent(
 )
 
 
+def _stat_signature(path: Path) -> tuple[int, int] | None:
+    """(mtime_ns, size) of `path`, or None if it doesn't exist"""
+    try:
+        st = path.stat()
+    except FileNotFoundError:
+        return None
+    return st.st_mtime_ns, st.st_size
+
+
+def _write_default_prompt() -> None:
+    """Create the default base prompt, unless another process got there first"""
+    GLOBAL_PROMPT_PATH.parent.mkdir(parents=True, exist_ok=True)
+    try:
+        # O_EXCL so concurrent servers never overwrite each other or a user's edits
+        fd = os.open(GLOBAL_PROMPT_PATH, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o644)
+    except FileExistsError:
+        return
+
+    with open(fd, "w", encoding="utf-8") as f:
+        f.write(QUIBBLER_BASE_INSTRUCTIONS)
+    logger.info("Created default base prompt at %s", GLOBAL_PROMPT_PATH)
+
+
+def _rules_section(rules_path: Path, rules_content: str) -> str:
+    """Prompt section for the project rules, inline or as an index of titles"""
+    if len(rules_content) > MAX_INLINE_RULES_SIZE:
+        titles = _RULE_TITLE_RE.findall(rules_content)
+        if titles:
+            index = "".join(f"- {title.strip()}\n" for title in titles)
+            return (
+                "\n\n## Project-Specific Rules\n\n"
+                f"This project has {len(titles)} rules in {rules_path}. Read that "
+                "file for the full text before judging changes against a rule:\n\n"
+                + index
+            )
+
+    return "\n\n## Project-Specific Rules\n\n" + rules_content
+
+
+@lru_cache(maxsize=32)
+def _assemble_prompt(
+    rules_path: Path,
+    mode: Literal["hook", "mcp"],
+    base_signature: tuple[int, int] | None,
+    rules_signature: tuple[int, int] | None,
+) -> str:
+    """Read and assemble the prompt, memoized until either file changes"""
+    logger.info("Loading base prompt from %s for mode=%s", GLOBAL_PROMPT_PATH, mode)
+    # Prompt files are UTF-8, whatever the locale's preferred encoding is
+    base_prompt = GLOBAL_PROMPT_PATH.read_bytes().decode("utf-8")
+
+    # Append mode-specific instructions
+    parts = [
+        base_prompt,
+        "\n\n",
+        MCP_MODE_INSTRUCTIONS if mode == "mcp" else HOOK_MODE_INSTRUCTIONS,
+    ]
+
+    # Append project-specific rules if they exist
+    if rules_signature is not None:
+        rules_content = rules_path.read_bytes().decode("utf-8")
+        logger.info("Loading project rules from %s", rules_path)
+        parts.append(_rules_section(rules_path, rules_content))
+
+    # One join sizes and copies the prompt once instead of per concatenation
+    return "".join(parts)
+
+
 def load_prompt(source_path: str, mode: Literal["hook", "mcp"] = "hook") -> str:
     """
     Load the quibbler prompt with mode-specific instructions and append project rules if they exist.
@@ -188,7 +269,11 @@ def load_prompt(source_path: str, mode: Literal["hook", "mcp"] = "hook") -> str:
     Structure:
     1. Base instructions (from global config, customizable by user)
     2. Mode-specific instructions (always appended based on mode)
-    3. Project rules (from project .quibbler/rules.md if exists)
+    3. Project rules (from project .quibbler/rules.md if exists - listed by
+       title only once the file exceeds MAX_INLINE_RULES_SIZE)
+
+    The assembled prompt is cached until the base prompt or rules file
+    changes, so repeated calls only stat the two files.
 
     Args:
         source_path: Project directory to check for project rules
@@ -197,29 +282,13 @@ def load_prompt(source_path: str, mode: Literal["hook", "mcp"] = "hook") -> str:
     Returns:
         The full prompt text (base + mode-specific + project rules if they exist)
     """
-    global_prompt_path = Path.home() / ".quibbler" / "prompt.md"
-    global_prompt_path.parent.mkdir(parents=True, exist_ok=True)
-
     # Load or create global base prompt
-    if not global_prompt_path.exists():
-        global_prompt_path.write_text(QUIBBLER_BASE_INSTRUCTIONS)
-        logger.info(f"Created default base prompt at {global_prompt_path}")
-
-    logger.info(f"Loading base prompt from {global_prompt_path} for mode={mode}")
-    base_prompt = global_prompt_path.read_text()
+    base_signature = _stat_signature(GLOBAL_PROMPT_PATH)
+    if base_signature is None:
+        _write_default_prompt()
+        base_signature = _stat_signature(GLOBAL_PROMPT_PATH)
 
-    # Append mode-specific instructions
-    prompt = (
-        base_prompt
-        + "\n\n"
-        + (MCP_MODE_INSTRUCTIONS if mode == "mcp" else HOOK_MODE_INSTRUCTIONS)
-    )
-
-    # Append project-specific rules if they exist
     rules_path = Path(source_path) / ".quibbler" / "rules.md"
-    if rules_path.exists():
-        rules_content = rules_path.read_text()
-        logger.info(f"Loading project rules from {rules_path}")
-        prompt += "\n\n## Project-Specific Rules\n\n" + rules_content
-
-    return prompt
+    return _assemble_prompt(
+        rules_path, mode, base_signature, _stat_signature(rules_path)
+    )